@@ -4,49 +4,51 @@ from bokeh.events import ButtonClick
 from bokeh.models import markers, WMTSTileSource
 from bokeh.models.glyphs import MultiPolygons, Text
 from bokeh.models import Plot, Rect, ColumnDataSource
+from numpy import argsort, asarray, ascontiguousarray, issubdtype, number, unique, char, ndarray, isnan, nanmin, nanmax
+from numpy import bool_, floating, isinf, count_nonzero
+from pandas import DataFrame, Series
 
 from .color_utils import check_color, check_numeric, color_gradient, hls_palette, order_records
 
 # non-Google-Map map tile sources
 # adapted from https://github.com/holoviz/holoviews/blob/master/holoviews/element/tiles.py
+TILE_URLS = {
+    # CartoDB basemaps
+    'carto_dark': 'https://cartodb-basemaps-4.global.ssl.fastly.net/dark_all/{Z}/{X}/{Y}.png',
+    'carto_eco': 'https://3.api.cartocdn.com/base-eco/{Z}/{X}/{Y}.png',
+    'carto_light': 'https://cartodb-basemaps-4.global.ssl.fastly.net/light_all/{Z}/{X}/{Y}.png',
+    'carto_midnight': 'https://3.api.cartocdn.com/base-midnight/{Z}/{X}/{Y}.png',
+
+    # Stamen basemaps
+    'stamen_terrain': 'https://tile.stamen.com/terrain/{Z}/{X}/{Y}.png',
+    'stamen_terrain_retina':  'https://tile.stamen.com/terrain/{Z}/{X}/{Y}@2x.png',
+    'stame_watercolor': 'https://tile.stamen.com/watercolor/{Z}/{X}/{Y}.jpg',
+    'stamen_toner': 'https://tile.stamen.com/toner/{Z}/{X}/{Y}.png',
+    'stamen_toner_background': 'https://tile.stamen.com/toner-background/{Z}/{X}/{Y}.png',
+    'stamen_toner_labels': 'https://tile.stamen.com/toner-labels/{Z}/{X}/{Y}.png',
+
+    # Esri maps (see https://server.arcgisonline.com/arcgis/rest/services for the full list)
+    'esri_imagery': 'https://server.arcgisonline.com/ArcGIS/rest/services/World_Imagery/MapServer/tile/{Z}/{Y}/{X}.jpg',
+    'esri_natgeo': 'https://server.arcgisonline.com/ArcGIS/rest/services/NatGeo_World_Map/MapServer/tile/{Z}/{Y}/{X}',
+    'esri_usatopo': 'https://server.arcgisonline.com/ArcGIS/rest/services/USA_Topo_Maps/MapServer/tile/{Z}/{Y}/{X}',
+    'esri_terrain': 'https://server.arcgisonline.com/ArcGIS/rest/services/World_Terrain_Base/MapServer/tile/{Z}/{Y}/{X}',
+    'esri_reference': 'https://server.arcgisonline.com/ArcGIS/rest/services/Reference/World_Reference_Overlay/MapServer/tile/{Z}/{Y}/{X}',
+
+    # Miscellaneous
+    'osm': 'https://c.tile.openstreetmap.org/{Z}/{X}/{Y}.png',
+    'osm_bw': 'https://tiles.wmflabs.org/bw-mapnik/{z}/{x}/{y}.png',
+    'wikipedia': 'https://maps.wikimedia.org/osm-intl/{Z}/{X}/{Y}@2x.png'
+}
 
 
 def get_tile_source(name):
-    tiles = {
-        # CartoDB basemaps
-        'carto_dark': 'https://cartodb-basemaps-4.global.ssl.fastly.net/dark_all/{Z}/{X}/{Y}.png',
-        'carto_eco': 'https://3.api.cartocdn.com/base-eco/{Z}/{X}/{Y}.png',
-        'carto_light': 'https://cartodb-basemaps-4.global.ssl.fastly.net/light_all/{Z}/{X}/{Y}.png',
-        'carto_midnight': 'https://3.api.cartocdn.com/base-midnight/{Z}/{X}/{Y}.png',
-
-        # Stamen basemaps
-        'stamen_terrain': 'https://tile.stamen.com/terrain/{Z}/{X}/{Y}.png',
-        'stamen_terrain_retina':  'https://tile.stamen.com/terrain/{Z}/{X}/{Y}@2x.png',
-        'stame_watercolor': 'https://tile.stamen.com/watercolor/{Z}/{X}/{Y}.jpg',
-        'stamen_toner': 'https://tile.stamen.com/toner/{Z}/{X}/{Y}.png',
-        'stamen_toner_background': 'https://tile.stamen.com/toner-background/{Z}/{X}/{Y}.png',
-        'stamen_toner_labels': 'https://tile.stamen.com/toner-labels/{Z}/{X}/{Y}.png',
-
-        # Esri maps (see https://server.arcgisonline.com/arcgis/rest/services for the full list)
-        'esri_imagery': 'https://server.arcgisonline.com/ArcGIS/rest/services/World_Imagery/MapServer/tile/{Z}/{Y}/{X}.jpg',
-        'esri_natgeo': 'https://server.arcgisonline.com/ArcGIS/rest/services/NatGeo_World_Map/MapServer/tile/{Z}/{Y}/{X}',
-        'esri_usatopo': 'https://server.arcgisonline.com/ArcGIS/rest/services/USA_Topo_Maps/MapServer/tile/{Z}/{Y}/{X}',
-        'esri_terrain': 'https://server.arcgisonline.com/ArcGIS/rest/services/World_Terrain_Base/MapServer/tile/{Z}/{Y}/{X}',
-        'esri_reference': 'https://server.arcgisonline.com/ArcGIS/rest/services/Reference/World_Reference_Overlay/MapServer/tile/{Z}/{Y}/{X}',
-
-        # Miscellaneous
-        'osm': 'https://c.tile.openstreetmap.org/{Z}/{X}/{Y}.png',
-        'osm_bw': 'https://tiles.wmflabs.org/bw-mapnik/{z}/{x}/{y}.png',
-        'wikipedia': 'https://maps.wikimedia.org/osm-intl/{Z}/{X}/{Y}@2x.png'
-    }
-
     if name is None:
-        return list(tiles.keys())
+        return list(TILE_URLS.keys())
 
-    if name not in tiles:
+    if name not in TILE_URLS:
         return None
 
-    return WMTSTileSource(url=tiles[name])
+    return WMTSTileSource(url=TILE_URLS[name])
 
 
 # all supported models
@@ -112,90 +114,112 @@ DEFAULT_KWARGS = {
 }
 
 # filter boilerplate
+CHECKBOX_FILTER = '''
+        var indices = [];
+
+        for (var i = 0; i < widget.active.length; i++){
+            var rows = label_index[widget.labels[widget.active[i]]];
+            if (rows === undefined) {
+                continue;
+            }
+            for (var j = 0; j < rows.length; j++){
+                indices.push(rows[j]);
+            }
+        }
+        return indices;
+    '''
+
 FILTERS = {
     'Dropdown': '''
         var indices = [];
-        for (var i = 0; i <= source.data[reference].length; i++){
-            if (source.data[reference][i] == widget.value) {
-                indices.push(i)
+        var values = source.data[reference];
+        var n = values.length;
+        var value = widget.value;
+
+        for (var i = 0; i < n; i++){
+            if (values[i] == value) {
+                indices.push(i);
             }
         }
         return indices;
     ''',
     'Slider': '''
         var indices = [];
+        var values = source.data[reference];
+        var n = values.length;
         if (widget.step % 1 === 0){
-            var value = Math.trunc(widget.value)
+            var value = Math.trunc(widget.value);
         } else {
-            var value = widget.value
+            var value = widget.value;
         }
-        
-        for (var i = 0; i <= source.data[reference].length; i++){
-            if (source.data[reference][i] == widget.value) {
-                indices.push(i)
+
+        for (var i = 0; i < n; i++){
+            if (values[i] == value) {
+                indices.push(i);
             }
         }
         return indices;
     ''',
     'RangeSlider': '''
-        var indices = [];
         if (widget.step % 1 === 0){
-            var lower = Math.trunc(widget.value[0])
-            var upper = Math.trunc(widget.value[1])
+            var lower = Math.trunc(widget.value[0]);
+            var upper = Math.trunc(widget.value[1]);
         } else {
-            var lower = widget.value[0]
-            var upper = widget.value[1]        
+            var lower = widget.value[0];
+            var upper = widget.value[1];
         }
-        for (var i = 0; i <= source.data[reference].length; i++){
-            var value = source.data[reference][i]
-            if (value >= lower) {
-                if (value <= upper) {
-                    indices.push(i)
+
+        // non-numeric columns are not pre-sorted, so scan them
+        if (sorted_index === null) {
+            var indices = [];
+            var values = source.data[reference];
+            var n = values.length;
+
+            for (var i = 0; i < n; i++){
+                var value = values[i];
+                if (value >= lower && value <= upper) {
+                    indices.push(i);
                 }
             }
+            return indices;
         }
-        return indices;
-    ''',
-    'CheckboxGroup': '''
-        var indices = [];
-        var results = [];
 
-        for (var i = 0; i < widget.active.length; i++)
-            results.push(widget.labels[widget.active[i]]);
-
-        for (var i = 0; i < source.data[reference].length; i++){
-            var value_string = source.data[reference][i].toString()
-            if (results.includes(value_string)) {
-                indices.push(i)
+        // binary search for the first value >= lower, then the first value > upper
+        var values = sorted_values;
+        var lo = 0;
+        var hi = values.length;
+        while (lo < hi) {
+            var mid = (lo + hi) >>> 1;
+            if (values[mid] < lower) {
+                lo = mid + 1;
+            } else {
+                hi = mid;
             }
         }
-        return indices;
-    ''',
-    'CheckboxButtonGroup': '''
-        var indices = [];
-        var results = [];
-
-        for (var i = 0; i < widget.active.length; i++)
-            results.push(widget.labels[widget.active[i]]);
-
-        for (var i = 0; i < source.data[reference].length; i++){
-            var value_string = source.data[reference][i].toString()
-            if (results.includes(value_string)) {
-                indices.push(i)
+        var start = lo;
+
+        hi = values.length;
+        while (lo < hi) {
+            var mid = (lo + hi) >>> 1;
+            if (values[mid] <= upper) {
+                lo = mid + 1;
+            } else {
+                hi = mid;
             }
         }
-        return indices;
+        return sorted_index.slice(start, lo);
     ''',
+    'CheckboxGroup': CHECKBOX_FILTER,
+    'CheckboxButtonGroup': CHECKBOX_FILTER,
     'RadioButtonGroup': '''
         var indices = [];
-        var results = [];
-
+        var values = source.data[reference];
+        var n = values.length;
         var result = widget.labels[widget.active];
 
-        for (var i = 0; i < source.data[reference].length; i++){
-            var value_string = source.data[reference][i].toString()
-            if (result == value_string) {
-                indices.push(i)
+        for (var i = 0; i < n; i++){
+            if (String(values[i]) == result) {
+                indices.push(i);
             }
         }
         return indices;
@@ -203,6 +227,59 @@ FILTERS = {
 }
 
 
+def filter_index_args(widget_type, reference_array):
+    """
+    Build the lookup structures some entries of `FILTERS` expect as
+    extra arguments, so the filter does not rescan the data source on
+    every widget change: the RangeSlider filter binary searches sorted
+    values (numeric columns only), and the checkbox filters collect
+    precomputed row indices for each label.
+
+    """
+
+    if widget_type == 'RangeSlider':
+        values = asarray(reference_array)
+        if not issubdtype(values.dtype, number):
+            return {'sorted_index': None, 'sorted_values': None}
+        sorted_index = argsort(values, kind='mergesort')
+        sorted_values = values[sorted_index]
+        # NaN rows never fall in a range (and cannot be serialized); they sort last
+        n_valid = sorted_values.shape[0] - count_nonzero(isnan(sorted_values))
+        return {
+            'sorted_index': sorted_index[:n_valid].tolist(),
+            'sorted_values': sorted_values[:n_valid].tolist()
+        }
+    if widget_type in ('CheckboxGroup', 'CheckboxButtonGroup'):
+        label_index = dict()
+        for i, v in enumerate(reference_array):
+            label_index.setdefault(js_string(v), []).append(i)
+        return {'label_index': label_index}
+    return dict()
+
+
+def js_string(value):
+    """
+    Return a value as JavaScript's `String()` prints it, so that labels
+    match what the browser sees: `True` -> 'true', `2.0` -> '2',
+    `nan` -> 'NaN'.
+
+    """
+    if isinstance(value, (bool, bool_)):
+        return 'true' if value else 'false'
+    if isinstance(value, (float, floating)):
+        value = float(value)
+        if value != value:
+            return 'NaN'
+        if isinf(value):
+            return 'Infinity' if value > 0 else '-Infinity'
+        if value.is_integer() and (abs(value) < 1e21):
+            return str(int(value))
+        return repr(value)
+    if value is None:
+        return 'null'
+    return str(value)
+
+
 def auto_advance(slider, ms_delay=500):
     return CustomJS(args=dict(slider=slider), code="""
 
@@ -225,15 +302,92 @@ def auto_advance(slider, ms_delay=500):
                     )
 
 
-def auto_widget_kwarg(widget_type, kwarg, reference_array):
+def value_range(reference_array):
+    """Return the minimum and maximum of an array as Python scalars, ignoring missing values."""
+    values = asarray(reference_array)
+    if values.dtype == object:
+        # NaN and NaT are the values not equal to themselves
+        present = [v for v in reference_array if v == v]
+        if not present:
+            raise ValueError('The reference has no non-missing values to set a range from.')
+        return min(present), max(present)
+    if (values.size == 0) or ((values.dtype.kind in 'fcMm') and isnan(values).all()):
+        raise ValueError('The reference has no non-missing values to set a range from.')
+    if values.dtype.kind in 'Mm':
+        return tuple(Series([nanmin(values), nanmax(values)]).tolist())
+    return nanmin(values).item(), nanmax(values).item()
+
+
+def column_data(values):
+    """
+    Prepare an array for `ColumnDataSource.data`: bool, numeric and datetime
+    arrays are passed as contiguous arrays, which Bokeh can send as binary
+    buffers, and anything else as a list of Python objects.
+
+    """
+    values = asarray(values)
+    if values.dtype.kind in 'biufMm':
+        return ascontiguousarray(values)
+    return values.tolist()
+
+
+def text_width(name, values, max_sample=None):
+    """
+    Return the number of characters needed to display a column name and
+    all of its values as text (used to size data table columns). If
+    `max_sample` is given, longer columns are only measured on their first
+    and last `max_sample // 2` values.
+
+    """
+    if (max_sample is not None) and (len(values) > max_sample):
+        half = max(max_sample // 2, 1)
+        return max(text_width(name, values[:half]), text_width(name, values[-half:]))
+
+    if isinstance(values, ndarray) and (values.dtype.kind in 'biufU') and (len(values) > 0):
+        # typed arrays are converted to strings and measured in numpy
+        values_width = int(char.str_len(values.astype(str)).max())
+    else:
+        values_width = max(map(len, map(str, values)), default=0)
+    return max(values_width, len(name))
+
+
+def unique_values(reference_array):
+    """Return the distinct values of an array, sorted where the dtype allows it."""
+    values = asarray(reference_array)
+    if values.dtype == object:
+        # mixed Python objects cannot always be ordered
+        return list(set(values.tolist()))
+    if values.dtype.kind in 'Mm':
+        # through pandas, so datetimes come back as Timestamps rather than integer nanoseconds
+        return Series(unique(values)).tolist()
+    return unique(values).tolist()
+
+
+def reference_summary(widget_type, reference_array):
+    """
+    Return what the auto-populated kwargs of a widget type are derived from:
+    the range of the values for sliders, the distinct values otherwise.
+
+    """
+    if widget_type in ("RangeSlider", "Slider"):
+        return value_range(reference_array)
+    return unique_values(reference_array)
+
+
+def auto_widget_kwarg(widget_type, kwarg, reference_array, summary=None):
     """
     For a particular widget type, keyword argument, and array
-    of values, set reasonable defaults.
+    of values, set reasonable defaults. Callers filling in several
+    kwargs can pass `summary` (see `reference_summary`) so the
+    values are only summarized once.
     
     """
+
+    if summary is None:
+        summary = reference_summary(widget_type, reference_array)
     
     if widget_type in ("CheckboxGroup", "CheckboxButtonGroup"):
-        reference_set = list(set(reference_array))
+        reference_set = summary
         if kwarg == 'labels':
             return reference_set
         if kwarg == 'active':
@@ -242,27 +396,29 @@ def auto_widget_kwarg(widget_type, kwarg, reference_array):
             'The only auto-populating kwargs for {} are `labels` and `active`.'.format(widget_type)
         )
     if widget_type == "RangeSlider":
+        lower, upper = summary
         if kwarg == 'start':
-            return min(reference_array)
+            return lower
         if kwarg == 'end':
-            return max(reference_array)
+            return upper
         if kwarg == 'value':
-            return min(reference_array), max(reference_array)
+            return lower, upper
         raise ValueError(
             'The only auto-populating kwargs for {} are `start`, `end` and `value`.'.format(widget_type)
         ) 
     if widget_type == "Slider":
+        lower, upper = summary
         if kwarg == 'start':
-            return min(reference_array)
+            return lower
         if kwarg == 'end':
-            return max(reference_array)
+            return upper
         if kwarg == 'value':
-            return min(reference_array)
+            return lower
         raise ValueError(
             'The only auto-populating kwargs for {} are `start`, `end` and `value`.'.format(widget_type)
         )
     if widget_type == "Dropdown":
-        reference_set = list(set(reference_array))
+        reference_set = summary
         if kwarg == 'menu':
             return reference_set
         if kwarg == 'value':
@@ -271,7 +427,7 @@ def auto_widget_kwarg(widget_type, kwarg, reference_array):
             'The only auto-populating kwargs for {} are `menu` and `value`.'.format(widget_type)
         )    
     if widget_type in ("RadioButtonGroup", ):
-        reference_set = list(set(reference_array))
+        reference_set = summary
         if kwarg == 'labels':
             return reference_set
         if kwarg == 'active':
@@ -295,40 +451,39 @@ def prepare_properties(
 
     colorbar = None
 
-    hover_kwargs = dict()
-    for k, v in kwargs.items():
-        if k.startswith('hover_'):
-            hover_kwargs[k.replace('hover_', '')] = v
+    specs = bokeh_model.dataspecs()
+    color_specs = [v for v in specs if 'color' in v]
+    alpha_specs = [v for v in specs if 'alpha' in v]
 
-    for k in hover_kwargs.keys():
-        _ = kwargs.pop('hover_' + k)
+    hover_kwargs = dict()
+    for k in [k for k in kwargs if k.startswith('hover_')]:
+        hover_kwargs[k.replace('hover_', '')] = kwargs.pop(k)
 
-    if 'color' in kwargs.keys():
+    if 'color' in kwargs:
         color = kwargs.pop('color')
-        for v in bokeh_model.dataspecs():
-            if 'color' in v:
-                kwargs[v] = color
+        for v in color_specs:
+            kwargs[v] = color
 
-    color_keys = [key for key in bokeh_model.dataspecs() if ('color' in key) and (key in kwargs.keys())]
+    color_keys = [key for key in color_specs if key in kwargs]
 
     new_fields = dict()
     for key in color_keys:
         color_val = kwargs[key]
 
-        if color_val is None:
-            continue
-
-        if isinstance(color_val, str):
+        if isinstance(color_val, str) or color_val is None:
             if check_color(color_val):
                 continue
             else:
-                color_arr = source_df[color_val].tolist()
+                color_arr = source_df[color_val].to_numpy()
+                color_set = set(color_arr.tolist())
                 in_datasource = True
         else:
             color_arr = color_val
+            color_set = set(color_arr)
             in_datasource = False
 
-        if not all(check_color(c) for c in color_arr):
+        # only unique values need to be validated
+        if not all(check_color(c) for c in color_set):
 
             if check_numeric(color_arr):
                 if (start_hex is not None) and (end_hex is not None):
@@ -342,9 +497,9 @@ def prepare_properties(
                 else:
                     raise ValueError('Values for `start_hex` and `end_hex` must be supplied for numeric arrays.')
             else:
-                n_colors = len(set(color_arr))
+                n_colors = len(color_set)
                 color_df = source_df.groupby(color_arr)[['x_coord_point', 'y_coord_point']].mean()
-                score = order_records(color_df['x_coord_point'].tolist(), source_df['y_coord_point'].tolist())
+                score = order_records(color_df['x_coord_point'].tolist(), color_df['y_coord_point'].tolist())
                 palette = hls_palette(n_colors, h=0.5, l=0.5, s=1.0)
                 color_dict = dict(zip(color_df.index.tolist(), [palette[ind] for ind in score]))
                 color_new = [color_dict[ind] for ind in color_arr]
@@ -356,26 +511,26 @@ def prepare_properties(
             else:
                 kwargs[key] = color_new
 
-    if 'alpha' in kwargs.keys():
+    if 'alpha' in kwargs:
         alpha = kwargs.pop('alpha')
-        for v in bokeh_model.dataspecs():
-            if 'alpha' in v:
-                kwargs[v] = alpha
+        for v in alpha_specs:
+            kwargs[v] = alpha
                     
     return kwargs, hover_kwargs, new_fields, colorbar
 
 
 def make_colorbar(values, colors, bar_height):
-    val_list = list()
-    seen = set()
-    for val, color in zip(values, colors):
-        if color not in seen:
-            val_list.append((val, color))
-            seen.add(color)
-
-    val_opts, color_opts = zip(*sorted(val_list))
+    # keep the first value seen for each color, ordered by value
+    color_df = (
+        DataFrame({'vals': values, 'colors': colors})
+        .dropna(subset=['vals'])
+        .drop_duplicates('colors', keep='first')
+        .sort_values(['vals', 'colors'])
+    )
+    val_opts = color_df['vals'].tolist()
+    color_opts = color_df['colors'].tolist()
     n_opts = len(val_opts)
-    longest_val = len(max([str(v) for v in val_opts], key=len))
+    longest_val = int(color_df['vals'].astype(str).str.len().max())
     opt_inds = [v for v in range(n_opts)]
     max_color, max_val, max_ind = color_opts[0], val_opts[0], opt_inds[0]
     min_color, min_val, min_ind = color_opts[-1], val_opts[-1], opt_inds[-1]
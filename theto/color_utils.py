@@ -1,36 +1,86 @@
+from binascii import hexlify
+from collections import Counter
+from functools import lru_cache
+
 from bokeh.colors import named
-from numpy import array, repeat, argmax, linspace
+from numpy import array, asarray, full, argmax, linspace, ones, empty, empty_like, arange, subtract
+from numpy import ndarray, issubdtype, number, bool_, select, column_stack, isfinite
 
-NAMED_COLORS = {color: getattr(named, color).to_hex() for color in named.__all__}
+NAMED_COLOR_NAMES = frozenset(named.__all__)
 
 
-def minmax_scale(x, out_range=(-1, 1)):
-    if type(x) != array:
-        x = array(x)
-        
-    domain = min(x), max(x)
-    y = (x - (domain[1] + domain[0]) / 2) / (domain[1] - domain[0])
-    
-    return y * (out_range[1] - out_range[0]) + (out_range[1] + out_range[0]) / 2
+@lru_cache(maxsize=None)
+def named_color_to_hex(name):
+    """'white' -> '#ffffff' """
+    return getattr(named, name).to_hex()
+
+
+def __getattr__(name):
+    # the full name -> hex mapping is only built if something asks for it (PEP 562)
+    if name == 'NAMED_COLORS':
+        value = {color: named_color_to_hex(color) for color in named.__all__}
+        globals()[name] = value
+        return value
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+
+def minmax_scale(x, out_range=(-1, 1), domain=None, out=None, constant=None):
+    x = asarray(x, dtype='float64')
+
+    # callers that already know the input's range can pass it as `domain`
+    if domain is None:
+        domain = x.min(), x.max()
+    if out is None:
+        out = empty_like(x)
+
+    # a zero-width domain has no scale; every value maps to `constant`
+    # (the lower end of `out_range` unless given)
+    if domain[1] == domain[0]:
+        out[...] = out_range[0] if constant is None else constant
+        return out
 
+    # scale in place in `out` rather than allocating a temporary per step
+    subtract(x, (domain[1] + domain[0]) / 2, out=out)
+    out /= domain[1] - domain[0]
+    out *= out_range[1] - out_range[0]
+    out += (out_range[1] + out_range[0]) / 2
 
+    return out
+
+
+@lru_cache(maxsize=8192)
 def hex_to_rgb(hexcode):
-    """'#FFFFFF' -> [255,255,255] """
-    # Pass 16 to the integer function for change of base
-    return [int(hexcode[i:i+2], 16) for i in range(1, 6, 2)]
+    """'#FFFFFF' -> (255,255,255) """
+    if len(hexcode) < 7:
+        raise ValueError('Hex colors must have six digits: {}'.format(hexcode))
+    # Parse all six digits at once and split the channels with bitshifts
+    v = int(hexcode[1:7], 16)
+    return (v >> 16) & 0xff, (v >> 8) & 0xff, v & 0xff
 
 
 def rgb_to_hex(rgb):
     """ [255,255,255] -> '#FFFFFF' """
     # Components need to be integers for hex to make sense
-    rgb = [int(x) for x in rgb]
-    return "#"+"".join(["0{0:x}".format(v) if v < 16 else "{0:x}".format(v) for v in rgb])
+    r, g, b = [int(x) for x in rgb]
+    return "#%02x%02x%02x" % (r, g, b)
+
 
+def rgb_array_to_hex(rgb):
+    """ array([[255,255,255], ...]) -> ['#ffffff', ...] """
+    rgb = asarray(rgb)
+    if not isfinite(rgb).all():
+        raise ValueError('RGB values must be finite to be converted to hex colors.')
+    # Hex-encode all the channel bytes in one C call, then cut six digits per color
+    rgb = rgb.astype('uint8')
+    hexbuf = hexlify(rgb.tobytes()).decode('ascii')
+    return ['#' + hexbuf[i:i + 6] for i in range(0, len(hexbuf), 6)]
 
+
+@lru_cache(maxsize=8192)
 def check_color(color):
     if color is None:
         return True
-    if color in NAMED_COLORS.keys():
+    if color in NAMED_COLOR_NAMES:
         return True
     else:
         try:
@@ -43,13 +93,19 @@ def check_color(color):
 def check_numeric(val):
     if isinstance(val, (int, float)):
         return True
+    elif isinstance(val, ndarray):
+        # typed arrays can be judged by dtype; object arrays are checked per element,
+        # iterating the array itself (its items are already Python objects)
+        if issubdtype(val.dtype, number) or issubdtype(val.dtype, bool_):
+            return True
+        return all(isinstance(x, (int, float)) for x in val)
     elif isinstance(val, (list, tuple, set)):
         return all(isinstance(x, (int, float)) for x in val)
     else:
         return False
 
     
-def color_gradient(vals, start_hex, end_hex, mid_hex='#ffffff', trans=None):
+def color_gradient(vals, start_hex, end_hex, mid_hex='#ffffff', trans=None, nan_hex='#808080'):
     """
     Returns a gradient list of colors between two hex colors (adapted 
     from https://bsou.io/posts/color-gradients-with-python). Gradient 
@@ -57,68 +113,100 @@ def color_gradient(vals, start_hex, end_hex, mid_hex='#ffffff', trans=None):
     `vals`. If `vals` include both positive negative numbers, gradient goes 
     from `start_hex` to `mid_hex` (default of white at zero), to `end_hex`.
     Values for start_hex and end_hex should be the full six-digit color string, 
-    including the number sign ("#FFFFFF").
+    including the number sign ("#FFFFFF"). Missing (NaN) and infinite values
+    are colored `nan_hex` and left out of the gradient.
     
     """
     
-    # convert vals to array
+    # convert vals to array; the extremes and sign masks are reused below
     sarr = array(vals).astype('float64')
-    has_neg = min(vals) < 0
-    has_pos = max(vals) > 0
+    finite = isfinite(sarr)
+    if not finite.all():
+        colors = full(sarr.shape[0], nan_hex, dtype=object)
+        if finite.any():
+            colors[finite] = color_gradient(
+                sarr[finite], start_hex, end_hex, mid_hex=mid_hex, trans=trans, nan_hex=nan_hex
+            )
+        return colors.tolist()
+
+    lo, hi = sarr.min(), sarr.max()
+    has_neg = lo < 0
+    has_pos = hi > 0
     
     # colors in RGB form
-    s = hex_to_rgb(start_hex)
-    f = hex_to_rgb(end_hex)
-    m = hex_to_rgb(mid_hex)
+    s = array(hex_to_rgb(start_hex))
+    f = array(hex_to_rgb(end_hex))
+    m = array(hex_to_rgb(mid_hex))
 
     if not all([has_neg, has_pos]):
+        # `sarr` is our own copy, so it can be scaled in place; the output
+        # of `trans` is not, so it gets a fresh array
+        domain, out = (lo, hi), sarr
         if trans is not None:
-            sarr = trans(minmax_scale(sarr, out_range=(1e-10, 10)))
-        sarr = minmax_scale(sarr, out_range=(0, 1))
+            sarr = trans(minmax_scale(sarr, out_range=(1e-10, 10), domain=domain, out=sarr))
+            domain = out = None
+        sarr = minmax_scale(sarr, out_range=(0, 1), domain=domain, out=out)
         
-        return [rgb_to_hex(rgb) for rgb in zip(*[(s[j] + sarr * (f[j] - s[j])) for j in range(3)])]
+        return rgb_array_to_hex(s + sarr[:, None] * (f - s))
     else:
-        sarr_neg = sarr[sarr <= 0]
-        sarr_pos = sarr[sarr >= 0]
+        pos_mask = sarr >= 0
+        neg_mask = sarr <= 0
+        sarr_pos = sarr[pos_mask]
+        sarr_neg = sarr[neg_mask]
+        pos_domain = (sarr_pos.min(), hi)
+        neg_domain = (lo, sarr_neg.max())
+        pos_out, neg_out = sarr_pos, sarr_neg
         if trans is not None:
-            sarr_pos = trans(minmax_scale(sarr_pos, out_range=(1e-10, 10)))
-            sarr_neg = trans(minmax_scale(sarr_neg, out_range=(1e-10, 10)))
+            sarr_pos = trans(minmax_scale(sarr_pos, out_range=(1e-10, 10), domain=pos_domain, out=sarr_pos))
+            sarr_neg = trans(minmax_scale(sarr_neg, out_range=(1e-10, 10), domain=neg_domain, out=sarr_neg))
+            pos_domain = neg_domain = pos_out = neg_out = None
 
-        sarr_pos = minmax_scale(sarr_pos, out_range=(0, 1))
-        sarr_neg = minmax_scale(sarr_neg, out_range=(0, 1))
+        # a single distinct value on either side takes that side's extreme color
+        sarr_pos = minmax_scale(sarr_pos, out_range=(0, 1), domain=pos_domain, out=pos_out, constant=1)
+        sarr_neg = minmax_scale(sarr_neg, out_range=(0, 1), domain=neg_domain, out=neg_out, constant=0)
         
-        sarr_new = repeat(mid_hex, sarr.shape[0])
-        sarr_new[sarr >= 0] = [
-            rgb_to_hex(rgb) 
-            for rgb in zip(*[(m[j] + sarr_pos * (f[j] - m[j])) for j in range(3)])
-        ]
-        sarr_new[sarr <= 0] = [
-            rgb_to_hex(rgb) 
-            for rgb in zip(*[(s[j] + sarr_neg * (m[j] - s[j])) for j in range(3)])
-        ]
+        sarr_new = full(sarr.shape[0], mid_hex, dtype=object)
+        sarr_new[pos_mask] = rgb_array_to_hex(m + sarr_pos[:, None] * (f - m))
+        sarr_new[neg_mask] = rgb_array_to_hex(s + sarr_neg[:, None] * (m - s))
 
         return sarr_new
 
 
-def order_records(x_coords, y_coords):
+def order_records(x_coords, y_coords, max_matrix_size=2000):
+    """
+    Order records so that each record is followed by the unvisited record
+    farthest away from it, and return each record's position in that order.
+    Squared distances are used (the ordering is the same) and, for up to
+    `max_matrix_size` records, computed once as a pairwise matrix instead
+    of on every step.
+
+    """
     n_records = len(x_coords)
-    record_inds = list(range(n_records))
-    a = array(list(zip(x_coords, y_coords)))
+    a = array(list(zip(x_coords, y_coords)), dtype='float64').reshape(-1, 2)
 
-    inds = array([True] * n_records)
-    current_ind = 0
+    if n_records <= max_matrix_size:
+        dist_matrix = ((a[:, None, :] - a[None, :, :]) ** 2).sum(axis=2)
+    else:
+        dist_matrix = None
+
+    inds = ones(n_records, dtype=bool)
     ind_order = list()
+    current_ind = 0
 
-    while any(inds):
+    for _ in range(n_records):
         inds[current_ind] = False
         ind_order.append(current_ind)
-        dists = ((a[current_ind, :] - a) ** 2).sum(axis=1) ** 0.5
-        dists[~inds] = -1
+        if dist_matrix is not None:
+            dist_matrix[:, current_ind] = -1
+            dists = dist_matrix[current_ind]
+        else:
+            dists = ((a[current_ind, :] - a) ** 2).sum(axis=1)
+            dists[~inds] = -1
         current_ind = argmax(dists)
 
-    order_dict = dict(zip([record_inds[ind] for ind in ind_order], record_inds))
-    score = [order_dict[ind] for ind in record_inds]
-    return score
+    score = empty(n_records, dtype='int64')
+    score[ind_order] = arange(n_records)
+    return score.tolist()
 
 
 def _v(m1, m2, hue):
@@ -147,6 +235,33 @@ def hls_to_rgb(h, l, s):
     return int(r * 255.0), int(g * 255.0), int(b * 255.0)
 
 
+def _v_array(m1, m2, hue):
+    """Vectorized `_v` over an array of hues."""
+    hue = hue % 1.0
+    return select(
+        [hue < (1 / 6), hue < 0.5, hue < (2 / 3)],
+        [m1 + (m2 - m1) * hue * 6.0, m2, m1 + (m2 - m1) * ((2 / 3) - hue) * 6.0],
+        default=m1
+    )
+
+
+def hls_array_to_rgb(hues, l, s):
+    """
+    Vectorized `hls_to_rgb` for an array of hues with a shared lightness
+    and saturation; returns an (N, 3) array of 0-255 integers.
+    """
+    hues = asarray(hues, dtype='float64')
+    if s == 0.0:
+        rgb = column_stack([full(hues.shape[0], l)] * 3)
+    else:
+        m2 = l * (1.0 + s) if l <= 0.5 else l + s - (l * s)
+        m1 = 2.0 * l - m2
+        rgb = column_stack([
+            _v_array(m1, m2, hues + (1.0 / 3.0)), _v_array(m1, m2, hues), _v_array(m1, m2, hues - (1.0 / 3.0))
+        ])
+    return (rgb * 255.0).astype('int64')
+
+
 def rgb_to_hex_sep(r, g, b):
     return "#{0:02x}{1:02x}{2:02x}".format(r, g, b)
 
@@ -179,15 +294,12 @@ def hls_palette(n_colors=6, h=.01, l=.6, s=.65):
     hues += h
     hues %= 1
     hues -= hues.astype(int)
-    palette = [rgb_to_hex_sep(*hls_to_rgb(h_i, l, s)) for h_i in hues]
+    palette = rgb_array_to_hex(hls_array_to_rgb(hues, l, s))
     return palette
 
 
 def assign_colors(color_arr, start=None, end=None, mid='#ffffff', trans=None, categorical_palette=None):
 
-    if categorical_palette is None:
-        categorical_palette = None
-    
     # continuous palette
     if check_numeric(color_arr):
         if (start is not None) and (end is not None):
@@ -196,24 +308,20 @@ def assign_colors(color_arr, start=None, end=None, mid='#ffffff', trans=None, ca
             raise ValueError('Values for `start` and `end` must be supplied for numeric arrays.')
 
     # categorical palette
-    value_set = set(color_arr)
-    n_colors = len(value_set)
+    value_counts = Counter(color_arr)
+    n_colors = len(value_counts)
+
+    if categorical_palette is None:
+        categorical_palette = hls_palette(n_colors)
     palette_length = len(categorical_palette)
 
     if n_colors <= palette_length:
-        color_dict = dict(zip(value_set, categorical_palette[:n_colors]))
+        color_dict = dict(zip(value_counts, categorical_palette))
     else:
-        val_count_dict = dict()
-        for val in color_arr:
-            if val in val_count_dict.keys():
-                val_count_dict[val] += 1
-            else:
-                val_count_dict[val] = 1
-        color_dict = dict()
-        n = 0
-        for val, num in sorted(val_count_dict.items(), reverse=True):
-            color_dict[val] = categorical_palette[n]
-            if n < (palette_length - 1):
-                n += 1
+        # the most common values get their own colors, the rest share the last one
+        color_dict = {
+            val: categorical_palette[min(n, palette_length - 1)]
+            for n, (val, _) in enumerate(value_counts.most_common())
+        }
 
     return [color_dict[v] for v in color_arr]
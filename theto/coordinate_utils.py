@@ -1,9 +1,11 @@
 from shapely.wkt import loads, dumps
-from pyproj import Proj, transform as pyproj_transform
+from pyproj import Transformer
 from math import log10
-from json import loads as json_loads
 from shapely.geometry import shape, box
-from functools import partial
+from functools import lru_cache
+from itertools import islice
+from numpy import asarray, zeros_like, around, empty, concatenate, cumsum, split, bincount, subtract, absolute
+from numpy import array, char, frombuffer, bitwise_or, where, ldexp
 from shapely.ops import transform as shapely_transform
 
 from shapely.geometry import (
@@ -17,19 +19,36 @@ from shapely.geometry import (
     GeometryCollection
 )
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional and only speeds up GeoJSON parsing
+    from json import loads as json_loads
+
+try:
+    from shapely import get_coordinates, from_wkt, points, representative_point, box as boxes
+except ImportError:  # shapely < 2.0
+    get_coordinates = from_wkt = points = representative_point = boxes = None
+
 BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
 
+# base32 value of each character code below 256 (-1 if not a geohash character)
+BASE32_VALUES = tuple(BASE32.find(chr(i)) for i in range(256))
+BASE32_DELETE = str.maketrans('', '', BASE32)
+
 VALID_WKT_TYPES = [
     'GEOMETRY', 
     'POINT', 
     'MULTIPOINT', 
     'LINESTRING',
-    'LINEARRING'
+    'LINEARRING',
     'MULTILINESTRING', 
     'POLYGON', 
     'MULTIPOLYGON'
 ]
 
+# str.startswith checks a tuple of prefixes in a single call
+WKT_PREFIXES = tuple(VALID_WKT_TYPES)
+
 
 VALID_SHAPELY_TYPES = (
     Polygon, 
@@ -42,44 +61,128 @@ VALID_SHAPELY_TYPES = (
     GeometryCollection
 )
 
-webmercator_project = partial(
-    pyproj_transform,
-    Proj(init='epsg:4326'),  # source coordinate system
-    Proj(init='epsg:3857')  # destination coordinate system
-)
+@lru_cache(maxsize=32)
+def get_transformer(source='EPSG:4326', destination='EPSG:3857'):
+    """
+    Build a pyproj Transformer once per pair of coordinate systems; setting
+    one up is far more expensive than the transformations themselves.
+    Coordinates are always passed and returned as (longitude, latitude).
+
+    """
+    return Transformer.from_crs(source, destination, always_xy=True)
 
 
 def to_webmercator(pol):
-    return shapely_transform(webmercator_project, pol)
+    return shapely_transform(get_transformer().transform, pol)
 
 
-def divide_range_decode(coordinate_range, b):
-    mid = (coordinate_range[0] + coordinate_range[1]) / 2
-    if b:
-        coordinate_range[0] = mid
-    else:
-        coordinate_range[1] = mid
+def squash_even_bits(x):
+    """
+    Keep the bits of `x` at even positions (0, 2, 4, ...) and pack them
+    together (the inverse of a Morton-code spread), for values < 2 ** 64.
+
+    """
+    x &= 0x5555555555555555
+    x = (x | (x >> 1)) & 0x3333333333333333
+    x = (x | (x >> 2)) & 0x0F0F0F0F0F0F0F0F
+    x = (x | (x >> 4)) & 0x00FF00FF00FF00FF
+    x = (x | (x >> 8)) & 0x0000FFFF0000FFFF
+    x = (x | (x >> 16)) & 0x00000000FFFFFFFF
+    return x
+
+
+# below this many hashes, decoding one at a time is cheaper than setting up the arrays
+GEOHASH_BATCH_MIN_HASHES = 16
+
+# base32 value of each byte, as a lookup array for decoding whole byte buffers
+# (padding and invalid bytes map to 0, so hashes must be validated first)
+BASE32_BYTE_VALUES = array([max(v, 0) for v in BASE32_VALUES], dtype='uint64')
+
+# bit position of each of the (up to) 12 characters in a 60-bit geohash
+GEOHASH_CHAR_SHIFTS = array([5 * (11 - j) for j in range(12)], dtype='uint64')
+
+
+def decode_geohash_array(geohashes):
+    """
+    Decode valid geohashes of up to 12 characters with numpy. The hashes
+    are packed into one fixed-width byte buffer, each row is read into a
+    60-bit integer, the interleaved longitude and latitude bits are
+    separated with bit tricks, and each cell is placed with `ldexp`
+    instead of halving the coordinate ranges bit by bit.
+
+    """
+    raw = array(geohashes, dtype='S12')
+    n_bits = 5 * char.str_len(raw)
+    codes = BASE32_BYTE_VALUES[frombuffer(raw.tobytes(), dtype='uint8').reshape(-1, 12)]
+    bits = bitwise_or.reduce(codes << GEOHASH_CHAR_SHIFTS, axis=1)
+    bits >>= (60 - n_bits).astype('uint64')
+
+    # bits alternate longitude, latitude, ... starting from the most significant one
+    lon_bits = (n_bits + 1) // 2
+    lat_bits = n_bits // 2
+    even = n_bits % 2 == 0
+    shifted = bits >> 1
+    lon_int = squash_even_bits(where(even, shifted, bits))
+    lat_int = squash_even_bits(where(even, bits, shifted))
+
+    latitude = ldexp(2.0 * lat_int + 1.0, -lat_bits - 1) * 180.0 - 90.0
+    longitude = ldexp(2.0 * lon_int + 1.0, -lon_bits - 1) * 360.0 - 180.0
+
+    return latitude, longitude, ldexp(90.0, -lat_bits), ldexp(180.0, -lon_bits)
+
+
+def geohash_array_to_centroids(geohashes):
+    """
+    Decode many geohashes at once. Returns four float64 arrays: latitude,
+    longitude, latitude error and longitude error.
+
+    """
+    geohashes = list(geohashes)
+    n = len(geohashes)
+
+    # invalid input goes through the scalar decoder, which reports it as a ValueError
+    if (n >= GEOHASH_BATCH_MIN_HASHES) and all(validate_geohash(geohash) for geohash in geohashes):
+        return decode_geohash_array(geohashes)
+
+    latitude, longitude = empty(n, dtype='float64'), empty(n, dtype='float64')
+    latitude_error, longitude_error = empty(n, dtype='float64'), empty(n, dtype='float64')
+    for i, geohash in enumerate(geohashes):
+        latitude[i], longitude[i], latitude_error[i], longitude_error[i] = geohash_to_centroid(geohash)
+
+    return latitude, longitude, latitude_error, longitude_error
 
 
 def geohash_to_centroid(geohash, return_error=True):
-    binary_string = ''.join([format(BASE32.index(v), 'b').zfill(5) for v in geohash])
-    latitude_range = [-90.0, 90.0]
-    longitude_range = [-180.0, 180.0]
+    lat_lo, lat_hi = -90.0, 90.0
+    lon_lo, lon_hi = -180.0, 180.0
     is_even_bit = True
 
-    for j, v in enumerate(binary_string):
-        if is_even_bit:
-            divide_range_decode(longitude_range, v != '0')
-        else:
-            divide_range_decode(latitude_range, v != '0')
-        is_even_bit = not is_even_bit
-
-    latitude = (latitude_range[0] + latitude_range[1]) / 2
-    longitude = (longitude_range[0] + longitude_range[1]) / 2
+    for v in geohash:
+        code = ord(v)
+        cd = BASE32_VALUES[code] if code < 256 else -1
+        if cd < 0:
+            raise ValueError('Invalid geohash character: {}'.format(v))
+        for mask in (16, 8, 4, 2, 1):
+            if is_even_bit:
+                mid = (lon_lo + lon_hi) / 2
+                if cd & mask:
+                    lon_lo = mid
+                else:
+                    lon_hi = mid
+            else:
+                mid = (lat_lo + lat_hi) / 2
+                if cd & mask:
+                    lat_lo = mid
+                else:
+                    lat_hi = mid
+            is_even_bit = not is_even_bit
+
+    latitude = (lat_lo + lat_hi) / 2
+    longitude = (lon_lo + lon_hi) / 2
+    latitude_error = (lat_hi - lat_lo) / 2
+    longitude_error = (lon_hi - lon_lo) / 2
 
     if return_error:
-        latitude_error = abs(latitude_range[0] - latitude_range[1]) / 2
-        longitude_error = abs(longitude_range[0] - longitude_range[1]) / 2
         return latitude, longitude, latitude_error, longitude_error
     else:
         return latitude, longitude
@@ -91,18 +194,20 @@ def validate_geohash(value):
     if len(value) > 12:
         return False
     
-    return all(v in BASE32 for v in value)
+    # deleting every base32 character leaves nothing for a valid geohash
+    return not value.translate(BASE32_DELETE)
 
 
 def detect_geojson(value):
-    """Check whether an input value is a valid geohash"""
+    """
+    Check whether an input value looks like a GeoJSON object: a JSON object
+    with the `geometry` or `coordinates` key that `import_geojson` needs.
+    Only the text is inspected; the value is not parsed.
+
+    """
 
     if isinstance(value, str):
-        try:
-            _ = json_loads(value)
-            return True
-        except Exception:
-            return False
+        return value.lstrip().startswith('{') and (('"geometry"' in value) or ('"coordinates"' in value))
     return False
 
 
@@ -117,7 +222,7 @@ def import_geojson(feature, precision=6):
         raise KeyError('Unable to infer key for coordinate values.')
 
     if isinstance(shape_object, Point):
-        shape_object = shape_object.buffer(0.1 ** precision).envelope
+        shape_object = point_to_box(shape_object.x, shape_object.y, 0.1 ** precision)
 
     return shape_object
 
@@ -125,7 +230,7 @@ def import_geojson(feature, precision=6):
 def validate_wellknowntext(value):
     """Check whether an input value is valid well-known text"""
         
-    return any(value.startswith(vt) for vt in VALID_WKT_TYPES)
+    return value.startswith(WKT_PREFIXES)
 
     
 def validate_shapelyobject(value):
@@ -134,80 +239,139 @@ def validate_shapelyobject(value):
     return issubclass(type(value), VALID_SHAPELY_TYPES)
     
 
+def point_to_box(x, y, half_width):
+    """
+    Square around a point; the same shape as `Point(x, y).buffer(half_width).envelope`
+    without running a GEOS buffer operation first.
+
+    """
+    return box(x - half_width, y - half_width, x + half_width, y + half_width)
+
+
+def geohash_to_bounds(value):
+    """Convert a geohash to its bounding box as a (minx, miny, maxx, maxy) tuple."""
+
+    y, x, y_margin, x_margin = geohash_to_centroid(value)
+
+    return x - x_margin, y - y_margin, x + x_margin, y + y_margin
+
+
 def geohash_to_shape(value):
     """Convert a geohash to a shapely object."""
 
-    y, x, y_margin, x_margin = geohash_to_centroid(value)
+    return box(*geohash_to_bounds(value))
 
-    minx = x - x_margin
-    maxx = x + x_margin
-    miny = y - y_margin
-    maxy = y + y_margin
 
-    return box(minx, miny, maxx, maxy)
+def geohashes_to_boxes(values):
+    """Convert many geohashes to shapely boxes, decoding them in one batch."""
+    y, x, y_margin, x_margin = geohash_array_to_centroids(values)
+    if boxes is not None:
+        # building the shapely objects is the expensive part, so it is vectorized too
+        return boxes(x - x_margin, y - y_margin, x + x_margin, y + y_margin).tolist()
+    return [
+        box(*bounds) for bounds in zip(
+            (x - x_margin).tolist(), (y - y_margin).tolist(), (x + x_margin).tolist(), (y + y_margin).tolist()
+        )
+    ]
 
 
 def geohash_to_coords(value, precision=6):
     """Convert a geohash to the x and y values of that geohash's bounding box."""
-    y, x, y_margin, x_margin = geohash_to_centroid(value)
-        
-    x_coords = [
-        round(x - x_margin, precision),
-        round(x - x_margin, precision),
-        round(x + x_margin, precision),
-        round(x + x_margin, precision)
-    ]
-        
-    y_coords = [
-        round(y + y_margin, precision),
-        round(y - y_margin, precision),
-        round(y - y_margin, precision),
-        round(y + y_margin, precision)
-    ]
+    minx, miny, maxx, maxy = [round(v, precision) for v in geohash_to_bounds(value)]
+
+    x_coords = [minx, minx, maxx, maxx]
+    y_coords = [maxy, miny, miny, maxy]
 
     return [{'exterior': x_coords, 'holes': []}], [{'exterior': y_coords, 'holes': []}]
 
 
+def ring_coordinates(rings):
+    """
+    Return the x and y coordinates of several rings as two flat arrays,
+    plus the offsets where each ring after the first one starts. On
+    shapely 2.x, all coordinates are fetched in one `get_coordinates` call.
+
+    """
+    rings = list(rings)
+    if get_coordinates is not None:
+        coords, index = get_coordinates(rings, return_index=True)
+        offsets = cumsum(bincount(index, minlength=len(rings)))[:-1]
+        return coords[:, 0], coords[:, 1], offsets
+
+    xy = [asarray(ring.coords.xy) for ring in rings]
+    merged = concatenate(xy, axis=1)
+    return merged[0], merged[1], cumsum([a.shape[1] for a in xy])[:-1]
+
+
+def shape_to_coords_soa(value, precision=6, wkt=False, is_point=False):
+    """
+    Convert a shape (a shapely object or well-known text) to flat, columnar
+    coordinates: rounded x and y arrays holding the vertices of every ring,
+    `ring_offsets` (ring i spans ring_offsets[i]:ring_offsets[i + 1] of the
+    coordinate arrays) and `polygon_offsets` (polygon j is made of rings
+    polygon_offsets[j]:polygon_offsets[j + 1], the exterior first).
+
+    """
+
+    if is_point:
+        value = point_to_box(value[0], value[1], 0.1 ** precision)
+
+    if wkt:
+        value = loads(value)
+    if hasattr(value, 'geoms'):
+        value = value.geoms
+    elif not hasattr(value, '__len__'):
+        value = [value]
+
+    rings = list()
+    polygon_offsets = [0]
+    for v in value:
+        # polygons are used as they are; only shapes without rings of
+        # their own go through the (expensive) GEOS buffer operation
+        if not isinstance(v, Polygon):
+            v = v.buffer(0)
+        rings.append(v.exterior)
+        rings.extend(v.interiors)
+        polygon_offsets.append(len(rings))
+
+    if len(rings) == 0:
+        xs, ys, offsets = empty(0, dtype='float64'), empty(0, dtype='float64'), []
+    else:
+        xs, ys, offsets = ring_coordinates(rings)
+
+    ring_offsets = concatenate([[0], offsets, [xs.shape[0]]]).astype('int64')
+
+    return around(xs, precision), around(ys, precision), ring_offsets, asarray(polygon_offsets, dtype='int64')
+
+
 def shape_to_coords(value, precision=6, wkt=False, is_point=False):
     """
     Convert a shape (a shapely object or well-known text) to x and y coordinates
     suitable for use in Bokeh's `MultiPolygons` glyph.
     
     """
-    
-    if is_point:
-        value = Point(*value).buffer(0.1 ** precision).envelope
-    
+
+    xs, ys, ring_offsets, polygon_offsets = shape_to_coords_soa(value, precision, wkt=wkt, is_point=is_point)
+    xs, ys, ring_offsets = xs.tolist(), ys.tolist(), ring_offsets.tolist()
+
     x_coords = list()
     y_coords = list()
-        
-    if wkt:
-        value = loads(value)
-    if not hasattr(value, '__len__'):
-        value = [value] 
-        
-    for v in value:
-        x_dict = dict()
-        y_dict = dict()
-        if not hasattr(v, 'exterior'):
-            v = v.buffer(0)
-        x_dict['exterior'] = [round(x, precision) for x in v.exterior.coords.xy[0]]
-        x_dict['holes'] = [[round(y, precision) for y in x.coords.xy[0]] for x in v.interiors]
-        y_dict['exterior'] = [round(x, precision) for x in v.exterior.coords.xy[1]]
-        y_dict['holes'] = [[round(y, precision) for y in x.coords.xy[1]] for x in v.interiors]
-        x_coords.append(x_dict)
-        y_coords.append(y_dict)
+    for first, last in zip(polygon_offsets[:-1].tolist(), polygon_offsets[1:].tolist()):
+        x_rings = [xs[ring_offsets[i]:ring_offsets[i + 1]] for i in range(first, last)]
+        y_rings = [ys[ring_offsets[i]:ring_offsets[i + 1]] for i in range(first, last)]
+        x_coords.append({'exterior': x_rings[0], 'holes': x_rings[1:]})
+        y_coords.append({'exterior': y_rings[0], 'holes': y_rings[1:]})
 
     return x_coords, y_coords
 
 
 def transform_lon(v, precision):
-    v = pyproj_transform(Proj(init='epsg:4326'), Proj(init='epsg:3857'), v, 0)[0]
+    v = get_transformer().transform(v, 0)[0]
     return round(v, precision)
 
 
 def transform_lat(v, precision):
-    v = pyproj_transform(Proj(init='epsg:4326'), Proj(init='epsg:3857'), 0, v)[1]
+    v = get_transformer().transform(0, v)[1]
     return round(v, precision)
 
 
@@ -215,33 +379,92 @@ def transform(v, precision=6, longitude=True):
     return transform_lon(v, precision) if longitude else transform_lat(v, precision)
 
 
-def coord_to_webmercator(c, precision=6, longitude=True):
+def transform_array(values, precision=6, longitude=True):
+    """Project an array of longitudes or latitudes to Web Mercator in one call."""
+    values = asarray(values, dtype='float64')
+    zeros = zeros_like(values)
+    if longitude:
+        projected = get_transformer().transform(values, zeros)[0]
+    else:
+        projected = get_transformer().transform(zeros, values)[1]
+    return around(projected, precision)
+
 
+@lru_cache(maxsize=None)
+def webmercator_precision(precision=6, longitude=True):
+    """Number of decimals in Web Mercator units matching `precision` decimal degrees."""
     p = transform(0.1 ** precision, precision, longitude)
-    p = int(round(log10(p))) * -1
+    return int(round(log10(p))) * -1
 
-    if not hasattr(c, '__len__'):
-        return transform(c, p, longitude)
 
-    output = list()
-    for row in c:
-        if not hasattr(row, '__len__'):
-            row = transform(row, p, longitude)
-            output.append(row)
-        else:
-            newrow = list()
-            for v in row:
-                v_new = dict()
-                v_new['exterior'] = [transform(val, p, longitude) for val in v['exterior']]
-                v_new['holes'] = [
-                    [transform(val, p, longitude) for val in interior] 
-                    for interior in v['holes']
-                ]
-                newrow.append(v_new)
+def values_to_webmercator(values, p, longitude=True):
+    """Project a flat sequence of longitudes or latitudes."""
+    return transform_array(values, p, longitude).tolist()
+
+
+def rings_to_webmercator(rows, p, longitude=True):
+    """
+    Project rows of {'exterior': [...], 'holes': [[...], ...]} dicts, as
+    produced by `shape_to_coords`, keeping their structure.
+
+    """
+    # collect every value in traversal order and project them in a single batch
+    flat = list()
+    for row in rows:
+        for v in row:
+            flat.extend(v['exterior'])
+            for interior in v['holes']:
+                flat.extend(interior)
+
+    projected = iter(transform_array(flat, p, longitude).tolist())
+
+    # rebuild the original structure from the projected values
+    return [
+        [
+            {
+                'exterior': list(islice(projected, len(v['exterior']))),
+                'holes': [list(islice(projected, len(interior))) for interior in v['holes']]
+            }
+            for v in row
+        ]
+        for row in rows
+    ]
+
+
+def to_webmercator_arrays(lons, lats):
+    """Project arrays of longitudes and latitudes to Web Mercator in one call."""
+    return get_transformer().transform(asarray(lons, dtype='float64'), asarray(lats, dtype='float64'))
+
+
+def flatten_rings(rows):
+    """
+    Concatenate every ring of rows of nested coordinate lists, as produced
+    by `shape_to_nested_list`, into one float64 array. The ring lengths are
+    returned too, for `unflatten_rings`.
+
+    """
+    rings = [ring for row in rows for pol in row for ring in pol]
+    if len(rings) == 0:
+        return empty(0, dtype='float64'), list()
+    return concatenate(rings).astype('float64', copy=False), [len(ring) for ring in rings]
+
+
+def unflatten_rings(values, ring_lengths, rows):
+    """Split a flat array from `flatten_rings` back into the nested layout of `rows`."""
+    parts = iter([part.tolist() for part in split(values, cumsum(ring_lengths)[:-1])])
+    return [[[next(parts) for _ in pol] for pol in row] for row in rows]
+
+
+def coord_to_webmercator(c, precision=6, longitude=True):
 
-            output.append(newrow)
+    p = webmercator_precision(precision, longitude)
 
-    return output
+    # the layout of the input is decided once, from its first element
+    if not hasattr(c, '__len__'):
+        return transform(c, p, longitude)
+    if (len(c) == 0) or not hasattr(c[0], '__len__'):
+        return values_to_webmercator(c, p, longitude)
+    return rings_to_webmercator(c, p, longitude)
 
 
 def validate_latlon_pair(value):
@@ -281,14 +504,14 @@ def process_input_value(value):
 
     """
 
-    if type(value) == str:
+    if isinstance(value, str):
         if validate_geohash(value):
             return geohash_to_shape(value)
         elif validate_wellknowntext(value):
             return loads(value)
         else:
             raise ValueError('String inputs must be either a geohash or well-known text.')
-    elif type(value) in (tuple, list):
+    elif isinstance(value, (tuple, list)):
         if validate_latlon_pair(value):
             return Point(*value)
     elif validate_shapelyobject(value):
@@ -297,30 +520,109 @@ def process_input_value(value):
         raise ValueError('Unrecognizeable input: {}.'.format(str(value)))
 
 
+def classify_input_value(value):
+    """
+    Determine what kind of input a value is: 'geohash', 'wkt', 'geojson',
+    'latlon' (a longitude/latitude pair) or 'shapely'.
+
+    """
+
+    if isinstance(value, str):
+        if validate_geohash(value):
+            return 'geohash'
+        elif validate_wellknowntext(value):
+            return 'wkt'
+        elif detect_geojson(value):
+            return 'geojson'
+        else:
+            raise ValueError('String inputs must be either a geohash, well-known text or GeoJSON.')
+    elif isinstance(value, (tuple, list)):
+        if validate_latlon_pair(value):
+            return 'latlon'
+    elif validate_shapelyobject(value):
+        return 'shapely'
+    else:
+        raise ValueError('Unrecognizeable input: {}.'.format(str(value)))
+
+
+def process_input_values(values, precision=6):
+    """
+    Batch version of `process_input_value` that also accepts GeoJSON.
+    Each value is classified once, and values of the same kind are
+    converted together, so geohashes are decoded in a single batch
+    (with numpy).
+
+    """
+
+    values = list(values)
+    groups = dict()
+    for i, v in enumerate(values):
+        groups.setdefault(classify_input_value(v), []).append(i)
+
+    processed = [None] * len(values)
+    for kind, inds in groups.items():
+        group = [values[i] for i in inds]
+        if kind == 'geohash':
+            shapes = geohashes_to_boxes(group)
+        elif kind == 'wkt':
+            # repeated strings (a source revisiting the same shapes) are parsed once
+            distinct = list(dict.fromkeys(group))
+            shapes = [loads(v) for v in distinct] if from_wkt is None else from_wkt(distinct).tolist()
+            if len(distinct) < len(group):
+                parsed = dict(zip(distinct, shapes))
+                shapes = [parsed[v] for v in group]
+        elif kind == 'geojson':
+            shapes = [import_geojson(v, precision) for v in group]
+        elif kind == 'latlon':
+            shapes = [Point(*v) for v in group] if points is None else points(group).tolist()
+        else:
+            shapes = group
+        for i, shp in zip(inds, shapes):
+            processed[i] = shp
+
+    return processed
+
+
+def representative_points(shapes):
+    """
+    Return the x and y coordinates of each shape's representative point
+    as two float64 arrays; on shapely 2.x this is a single vectorized call.
+
+    """
+    if representative_point is not None:
+        coords = get_coordinates(representative_point(list(shapes)))
+        return coords[:, 0].copy(), coords[:, 1].copy()
+
+    shapes = list(shapes)
+    xs, ys = empty(len(shapes), dtype='float64'), empty(len(shapes), dtype='float64')
+    for i, v in enumerate(shapes):
+        xs[i], ys[i] = v.representative_point().coords[0]
+    return xs, ys
+
+
 def polygon_to_nested_list(pol):
 
-    ext_x, ext_y = zip(*list(pol.exterior.coords))
-    x, y = [list(ext_x)], [list(ext_y)]
-    for interior in pol.interiors:
-        int_x, int_y = zip(*interior.coords)
-        x.append(list(int_x))
-        y.append(list(int_y))
-    return x, y
+    xs, ys, offsets = ring_coordinates([pol.exterior] + list(pol.interiors))
+    return [part.tolist() for part in split(xs, offsets)], [part.tolist() for part in split(ys, offsets)]
 
 
 def shape_to_nested_list(shp, buffer=0.000001):
-    if shp.geometryType() in ('LineString', 'LinearRing'):
+    geom_type = shp.geom_type
+    if geom_type in ('LineString', 'LinearRing'):
         xs, ys = polygon_to_nested_list(shp.buffer(buffer))
         xs, ys = [xs], [ys]
-    elif shp.geometryType() == 'Point':
-        xs, ys = polygon_to_nested_list(shp.buffer(buffer).envelope)
+    elif geom_type == 'Point':
+        xs, ys = polygon_to_nested_list(point_to_box(shp.x, shp.y, buffer))
         xs, ys = [xs], [ys]
-    elif shp.geometryType() == 'Polygon':
+    elif geom_type == 'Polygon':
         xs, ys = polygon_to_nested_list(shp)
         xs, ys = [xs], [ys]
-    elif shp.geometryType().startswith('Multi') or (shp.geometryType() == 'GeometryCollection'):
-        xs, ys = list(zip(*[shape_to_nested_list(pol) for pol in shp]))
-        xs, ys = [x[0] for x in xs], [y[0] for y in ys]
+    elif geom_type.startswith('Multi') or (geom_type == 'GeometryCollection'):
+        parts = list(shp.geoms)
+        xs, ys = [None] * len(parts), [None] * len(parts)
+        for i, part in enumerate(parts):
+            part_xs, part_ys = shape_to_nested_list(part, buffer)
+            xs[i], ys[i] = part_xs[0], part_ys[0]
     else:
         raise NotImplementedError('Unrecognized shapely shape type.')
     return xs, ys
@@ -330,3 +632,53 @@ def dumps_if_shapely(ob):
     if validate_shapelyobject(ob):
         return dumps(ob)
     return ob
+
+
+# below this many edges, the numpy version is faster than starting numba's threads
+PATH_NUMBA_MIN_EDGES = 100000
+
+
+@lru_cache(maxsize=None)
+def load_numba_utils():
+    """
+    Import the numba kernels in `numba_utils` on first use, or return None
+    if numba is not installed (it is optional, and slow to import).
+
+    """
+    try:
+        from . import numba_utils
+    except ImportError:
+        return None
+    return numba_utils
+
+
+def path_control_points(x1, y1, x2, y2):
+    """
+    Control points for curved path edges: the midpoint of each edge, offset
+    by half of the edge's extent along the other axis. Computed in place in
+    the two output arrays rather than through intermediate midpoint arrays,
+    or in one compiled pass for large paths when numba is available.
+
+    """
+    x1, y1 = asarray(x1, dtype='float64'), asarray(y1, dtype='float64')
+    x2, y2 = asarray(x2, dtype='float64'), asarray(y2, dtype='float64')
+    xc, yc = empty(len(x1), dtype='float64'), empty(len(y1), dtype='float64')
+
+    numba_utils = load_numba_utils() if len(x1) >= PATH_NUMBA_MIN_EDGES else None
+    if numba_utils is not None:
+        numba_utils.path_control_points_kernel(x1, y1, x2, y2, xc, yc)
+        return xc, yc
+
+    subtract(y1, y2, out=xc)
+    absolute(xc, out=xc)
+    xc += x1
+    xc += x2
+    xc *= 0.5
+
+    subtract(x1, x2, out=yc)
+    absolute(yc, out=yc)
+    yc += y1
+    yc += y2
+    yc *= 0.5
+
+    return xc, yc
@@ -1,10 +1,13 @@
-from math import sin, pi, log, floor
+from functools import lru_cache
+from math import sin, pi, log, floor, atanh
 
 
+@lru_cache(maxsize=4096)
 def lat_rad(lat):
     """Convert a latitude to radians (for estimating zoom factor for Google Maps)."""
     sine = sin(lat * pi / 180.)
-    rad_x2 = log((1 + sine) / (1 - sine)) / 2.
+    # atanh(x) == log((1 + x) / (1 - x)) / 2
+    rad_x2 = atanh(sine)
     return max(min(rad_x2, pi), -pi) / 2.
 
     
@@ -0,0 +1,12 @@
+# numba-compiled kernels. numba is optional and slow to import, so this module is
+# only imported by `coordinate_utils.load_numba_utils`, the first time a batch is
+# large enough to need it.
+from numba import njit, prange
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def path_control_points_kernel(x1, y1, x2, y2, xc, yc):
+    """Fill the control point arrays in a single parallel pass."""
+    for i in prange(x1.shape[0]):
+        xc[i] = (x1[i] + x2[i] + abs(y1[i] - y2[i])) * 0.5
+        yc[i] = (y1[i] + y2[i] + abs(x1[i] - x2[i])) * 0.5
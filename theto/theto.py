@@ -10,8 +10,10 @@ from bokeh.models import DataTable, TableColumn
 from bokeh.models import LinearAxis, MercatorTicker, MercatorTickFormatter
 
 from os import path
-from pandas import DataFrame
-from numpy import array
+from collections import namedtuple
+from itertools import chain
+from pandas import DataFrame, Series
+from numpy import around, argsort, arange, fromiter, repeat
 
 from . import bokeh_utils, coordinate_utils, gmaps_utils
 
@@ -20,6 +22,14 @@ class WorkflowOrderError(Exception):
     pass
 
 
+# the properties the special `color` and `alpha` kwargs of `add_path` expand to
+QUADRATIC_COLOR_SPECS = tuple(v for v in Quadratic.dataspecs() if 'color' in v)
+QUADRATIC_ALPHA_SPECS = tuple(v for v in Quadratic.dataspecs() if 'alpha' in v)
+
+# names of the source columns holding the coordinates for the chosen plot type
+CoordinateColumns = namedtuple('CoordinateColumns', ['x_shape', 'y_shape', 'x_point', 'y_point'])
+
+
 def flatten(items, seqtypes=(list, tuple)):
     for i, x in enumerate(items):
         while i < len(items) and isinstance(items[i], seqtypes):
@@ -91,10 +101,11 @@ class Theto(object):
         self.colorbar = None
 
         # removed 'x_coord_point', 'y_coord_point', 'raw_data'
-        self.omit_columns = [
+        # (a frozenset, since it is only used for membership checks)
+        self.omit_columns = frozenset([
             'index', 'x_coords', 'y_coords', 'x_coords_transform', 'y_coords_transform',
             'x_coord_point_transform', 'y_coord_point_transform'
-        ]
+        ])
 
         self.sources = dict()
         self.columndatasources = dict()
@@ -107,7 +118,11 @@ class Theto(object):
         self.xmax = None
         self.ymax = None
         self.plot = None
+        self.coordinate_columns = None
         self.legend = Legend(location='bottom_center', click_policy='hide', background_fill_color='#fafafa')
+        # collected by `add_layer` and `add_path`, and added to the plot in one go by `render_plot`
+        self.legend_items = list()
+        self.hover_tools = list()
         self.validation = {
             'add_source': False,
             'add_widget': False,
@@ -180,44 +195,17 @@ class Theto(object):
             if self.validation['render_plot']:
                 raise WorkflowOrderError('Method `render_plot` has already been called. Start new workflow.')
 
-    def _set_coordinate_bounds(self, df):
+    def _set_coordinate_bounds(self, xmin, xmax, ymin, ymax):
         """
-        Given a new source DataFrame, set or update 
-        coordinate bounds for the plot.
+        Given the coordinate bounds of a new source, set or
+        update coordinate bounds for the plot.
         
         """
 
-        x_coords = flatten(df['x_coords'].tolist())
-        y_coords = flatten(df['y_coords'].tolist())
-
-        xmin = min(x_coords)
-        xmax = max(x_coords)
-        ymin = min(y_coords)
-        ymax = max(y_coords)
-        
-        if self.xmin is not None:
-            if xmin < self.xmin:
-                self.xmin = xmin
-        else:
-            self.xmin = xmin
-
-        if self.xmax is not None:
-            if xmax > self.xmax:
-                self.xmax = xmax
-        else: 
-            self.xmax = xmax
-
-        if self.ymin is not None:
-            if ymin < self.ymin:
-                self.ymin = ymin
-        else:
-            self.ymin = ymin
-
-        if self.ymax is not None:
-            if ymax > self.ymax:
-                self.ymax = ymax
-        else:
-            self.ymax = ymax
+        self.xmin = xmin if self.xmin is None else min(self.xmin, xmin)
+        self.xmax = xmax if self.xmax is None else max(self.xmax, xmax)
+        self.ymin = ymin if self.ymin is None else min(self.ymin, ymin)
+        self.ymax = ymax if self.ymax is None else max(self.ymax, ymax)
 
     def add_source(self, data, label, uid=None, column_name=None, **kwargs):
         """
@@ -236,67 +224,74 @@ class Theto(object):
             objects, well-known text strings, or longitude/latitude pairs
         kwargs: lists of the same length as `data` if `data` is a list. These will be 
             appended to the data as metadata
+
+        A DataFrame passed as `data` is not deep-copied, so its existing columns
+        should not be modified in place after calling this method.
         
         """
         
         self._validate_workflow('add_source')
 
         # process data into x and y coordinates
-        if type(data) == DataFrame:
+        if isinstance(data, DataFrame):
             if column_name is None:
                 raise ValueError('If data is a dataframe then column_name must be specified.')
-            df = data.copy()
+            # new columns go on a shallow copy, so `data` itself is never modified
+            df = data.copy(deep=False)
             raw_data = df[column_name].values.tolist()
         else:
             raw_data = list(data)
             df = DataFrame(index=range(len(raw_data)))
             column_name = 'raw_data'
 
-        if all(coordinate_utils.detect_geojson(v) for v in raw_data):
-            processed_data = [coordinate_utils.import_geojson(v, self.precision) for v in raw_data]
-        else:
-            processed_data = [coordinate_utils.process_input_value(v) for v in raw_data]
+        processed_data = coordinate_utils.process_input_values(raw_data, self.precision)
 
-        processed_data_transformed = [coordinate_utils.to_webmercator(v) for v in processed_data]
         buf = 1 / (10 ** self.precision)
+        n = len(processed_data)
+
+        # original projection, in one pass writing into preallocated outputs
+        x_coords_shape, y_coords_shape = [None] * n, [None] * n
+        for i, v in enumerate(processed_data):
+            x_coords_shape[i], y_coords_shape[i] = coordinate_utils.shape_to_nested_list(v, buf)
+        x_coords_point, y_coords_point = coordinate_utils.representative_points(processed_data)
+
+        # all of the coordinates in one flat array each, for the plot bounds
+        x_coords_flat, _ = coordinate_utils.flatten_rings(x_coords_shape)
+        y_coords_flat, _ = coordinate_utils.flatten_rings(y_coords_shape)
+        self._set_coordinate_bounds(
+            x_coords_flat.min().item(), x_coords_flat.max().item(),
+            y_coords_flat.min().item(), y_coords_flat.max().item()
+        )
 
-        # original projection
-        x_coords_shape, y_coords_shape = zip(*[coordinate_utils.shape_to_nested_list(v, buf) for v in processed_data])
-        df['x_coords'], df['y_coords'] = list(x_coords_shape), list(y_coords_shape)
-
-        x_coords_point, y_coords_point = zip(*[list(*v.representative_point().coords) for v in processed_data])
-        df['x_coord_point'] = [round(v, self.precision) for v in x_coords_point]
-        df['y_coord_point'] = [round(v, self.precision) for v in y_coords_point]
-
-        # webmercator projection
-        x_coords_shape, y_coords_shape = zip(*[
-            coordinate_utils.shape_to_nested_list(v, buf) for v in processed_data_transformed
-        ])
-        df['x_coords_transform'], df['y_coords_transform'] = list(x_coords_shape), list(y_coords_shape)
-
-        x_coords_point, y_coords_point = zip(*[
-            list(*v.representative_point().coords) for v in processed_data_transformed
-        ])
-        df['x_coord_point_transform'] = [round(v, self.precision) for v in x_coords_point]
-        df['y_coord_point_transform'] = [round(v, self.precision) for v in y_coords_point]
-
-        if len(kwargs) > 0:
-            for k, v in kwargs.items():
-                df[k] = v
+        # the coordinate columns are added in a single `assign`; the webmercator
+        # columns are only added by `prepare_plot`, once the map type is known
+        df = df.assign(
+            x_coords=x_coords_shape,
+            y_coords=y_coords_shape,
+            x_coord_point=around(x_coords_point, self.precision, out=x_coords_point),
+            y_coord_point=around(y_coords_point, self.precision, out=y_coords_point)
+        )
 
-        self._set_coordinate_bounds(df)
+        # metadata is assigned column by column, so it can replace a generated
+        # column and callables are stored rather than called
+        for k, v in kwargs.items():
+            df[k] = v
 
-        df[column_name] = [coordinate_utils.dumps_if_shapely(ob) for ob in raw_data]
+        # shapely objects are stored as well-known text; other inputs are kept as they are
+        if any(coordinate_utils.validate_shapelyobject(ob) for ob in raw_data):
+            df[column_name] = [coordinate_utils.dumps_if_shapely(ob) for ob in raw_data]
+        elif column_name not in df.columns:
+            df[column_name] = raw_data
 
         if uid is None:
             df['uid'] = range(df.shape[0])
-        elif type(uid) is str:
+        elif isinstance(uid, str):
             df['uid'] = df[uid]
         else:
             df['uid'] = uid
             
-        self.sources[label] = df.copy()
-        self.remove_columns[label] = ['f', 'p']
+        self.sources[label] = df
+        self.remove_columns[label] = {'f', 'p'}
         self.validation['add_source'] = True
         
         return self
@@ -335,7 +330,13 @@ class Theto(object):
                 
         source = self.sources[source_label]
         
-        ref_array = source[reference].tolist()
+        # numeric references stay as arrays so the widget defaults and filter
+        # indexes are computed with numpy; other columns go through Python objects,
+        # and datetimes/timedeltas through pandas so they come back as Timestamps
+        # and Timedeltas rather than integer nanoseconds
+        ref_array = source[reference].to_numpy()
+        if ref_array.dtype.kind in 'OMm':
+            ref_array = source[reference].tolist()
 
         animation_kwargs = {'button_type': 'primary', 'label': 'Start', 'ms_delay': 500}
         remove_kw = list()
@@ -349,14 +350,15 @@ class Theto(object):
         for k in remove_kw:
             _ = kwargs.pop(k)
 
-        for k, v in bokeh_utils.DEFAULT_KWARGS[widget_type].items():
-            if k not in kwargs:
-                kwargs[k] = v
+        kwargs = {**bokeh_utils.DEFAULT_KWARGS[widget_type], **kwargs}
+        summary = None
+        for k, v in kwargs.items():
+            if v == 'auto':
+                if summary is None:
+                    summary = bokeh_utils.reference_summary(widget_type, ref_array)
+                kwargs[k] = bokeh_utils.auto_widget_kwarg(widget_type, k, ref_array, summary)
 
-        widget = bokeh_utils.WIDGETS[widget_type](name=widget_name, **{
-            k: v if v != 'auto' else bokeh_utils.auto_widget_kwarg(widget_type, k, ref_array)
-            for k, v in kwargs.items()
-        })
+        widget = bokeh_utils.WIDGETS[widget_type](name=widget_name, **kwargs)
 
         # This callback is crucial to trigger changes when the widget changes
         callback = CustomJS(args=dict(source=None), code="""
@@ -374,7 +376,10 @@ class Theto(object):
                 raise ValueError('Multiple widgets can only be used with custom_js.')
                 
             js_filter = CustomJSFilter(
-                args=dict(widget=widget, reference=reference), 
+                args=dict(
+                    widget=widget, reference=reference,
+                    **bokeh_utils.filter_index_args(widget_type, ref_array)
+                ),
                 code=bokeh_utils.FILTERS[widget_type]
             )
             
@@ -385,13 +390,15 @@ class Theto(object):
             js_filter = self.custom_js
             js_filter.args.update({widget_name: widget, widget_name + '_ref': reference})
 
-        self.widgets[widget_name] = {'widget': widget, 'filter': js_filter, 'source': source_label}
+        self.widgets[widget_name] = {
+            'widget': widget, 'filter': js_filter, 'callback': callback, 'source': source_label
+        }
 
         if animate:
             ms_delay = animation_kwargs.pop('ms_delay')
             button = bokeh_utils.Button(**animation_kwargs)
             button.js_on_event(bokeh_utils.ButtonClick, bokeh_utils.auto_advance(widget, ms_delay))
-            self.widgets['animation'] = {'widget': button, 'filter': None, 'source': None}
+            self.widgets['animation'] = {'widget': button, 'filter': None, 'callback': None, 'source': None}
 
         if source_label not in self.views:
             self.views[source_label] = CDSView(filters=[js_filter])
@@ -400,6 +407,28 @@ class Theto(object):
         
         return self
 
+    def _add_webmercator_columns(self, source_df):
+        """
+        Add the web Mercator projection of a source DataFrame's
+        coordinates, for plots drawn on tile maps.
+
+        """
+
+        # every coordinate of the source is projected in one batch
+        x_coords_flat, ring_lengths = coordinate_utils.flatten_rings(source_df['x_coords'])
+        y_coords_flat, _ = coordinate_utils.flatten_rings(source_df['y_coords'])
+        x_coords_flat, y_coords_flat = coordinate_utils.to_webmercator_arrays(x_coords_flat, y_coords_flat)
+        x_coords_point, y_coords_point = coordinate_utils.to_webmercator_arrays(
+            source_df['x_coord_point'].to_numpy(), source_df['y_coord_point'].to_numpy()
+        )
+
+        return source_df.assign(
+            x_coords_transform=coordinate_utils.unflatten_rings(x_coords_flat, ring_lengths, source_df['x_coords']),
+            y_coords_transform=coordinate_utils.unflatten_rings(y_coords_flat, ring_lengths, source_df['y_coords']),
+            x_coord_point_transform=around(x_coords_point, self.precision, out=x_coords_point),
+            y_coord_point_transform=around(y_coords_point, self.precision, out=y_coords_point)
+        )
+
     def _create_columndatasource(self, source_df):
         """
         Convert a source DataFrame into a Bokeh ColumnDataSource
@@ -407,24 +436,23 @@ class Theto(object):
         
         """
         
-        suffix = '_transform' if type(self.plot) != GMapPlot else ''
-        x_coords_label = 'x_coords{}'.format(suffix)
-        y_coords_label = 'y_coords{}'.format(suffix)
-        x_point_label = 'x_coord_point{}'.format(suffix)
-        y_point_label = 'y_coord_point{}'.format(suffix)
-
-        xsf = source_df[x_coords_label].tolist()
-        ysf = source_df[y_coords_label].tolist()
-
-        xsp = source_df[x_point_label].tolist()
-        ysp = source_df[y_point_label].tolist()
-        
-        omit = [c for c in self.omit_columns if c in source_df.columns]
-        source = ColumnDataSource(source_df.drop(omit, axis=1).to_dict('list'))
-        source.data['xsf'] = xsf
-        source.data['ysf'] = ysf
-        source.data['xsp'] = xsp
-        source.data['ysp'] = ysp
+        columns = self.coordinate_columns
+
+        # numeric columns are handed to Bokeh as arrays; only other columns
+        # need converting to lists of Python objects
+        data = dict()
+        for c in source_df.columns:
+            if c not in self.omit_columns:
+                data[c] = bokeh_utils.column_data(source_df[c].to_numpy())
+
+        # the ragged shape columns stay lists (of the existing nested lists);
+        # the point columns are plain float arrays
+        data['xsf'] = source_df[columns.x_shape].tolist()
+        data['ysf'] = source_df[columns.y_shape].tolist()
+        data['xsp'] = bokeh_utils.column_data(source_df[columns.x_point].to_numpy())
+        data['ysp'] = bokeh_utils.column_data(source_df[columns.y_point].to_numpy())
+
+        source = ColumnDataSource(data)
         
         return source
     
@@ -544,17 +572,21 @@ class Theto(object):
 
         else:
             raise ValueError('Invalid map_type.')
+
+        suffix = '' if isinstance(self.plot, GMapPlot) else '_transform'
+        self.coordinate_columns = CoordinateColumns(
+            'x_coords' + suffix, 'y_coords' + suffix, 'x_coord_point' + suffix, 'y_coord_point' + suffix
+        )
                     
         for source_label, source in self.sources.items():
+            if suffix:
+                source = self.sources[source_label] = self._add_webmercator_columns(source)
             source = self._create_columndatasource(source)
             
-            for widget_name in self.widgets.keys():
-                widget_dict = self.widgets[widget_name]
+            for widget_dict in self.widgets.values():
                 if widget_dict['source'] == source_label:
                     widget_dict['filter'].args['source'] = source
-                    for callback_list in widget_dict['widget'].js_property_callbacks.values():
-                        for callback in callback_list:
-                            callback.args['source'] = source
+                    widget_dict['callback'].args['source'] = source
                     
             if source_label in self.views:
                 self.views[source_label].source = source
@@ -626,7 +658,7 @@ class Theto(object):
 
         hover_object = None
         if bokeh_model == bokeh_utils.MODELS['MultiPolygons']:
-            if type(self.plot) == GMapPlot:
+            if isinstance(self.plot, GMapPlot):
                 raise ValueError(
                         'The `MultiPolygon` glyph cannot yet be used with a Google Maps plot.'
                     )
@@ -637,8 +669,7 @@ class Theto(object):
                     kwargs[k] = v
                 hover_object = bokeh_model(xs='xsf', ys='ysf', name=source_label, **kwargs)
 
-            if 'f' in self.remove_columns[source_label]:
-                _ = self.remove_columns[source_label].pop(self.remove_columns[source_label].index('f'))
+            self.remove_columns[source_label].discard('f')
 
         else:
 
@@ -649,8 +680,7 @@ class Theto(object):
                     kwargs[k] = v
                 hover_object = bokeh_model(xs='xsf', ys='ysf', name=source_label, **kwargs)
 
-            if 'p' in self.remove_columns[source_label]:
-                _ = self.remove_columns[source_label].pop(self.remove_columns[source_label].index('p'))
+            self.remove_columns[source_label].discard('p')
 
         if source_label in self.views:
             if len(hover_kwargs) > 0:
@@ -667,7 +697,7 @@ class Theto(object):
 
         if legend is not None:
             li = LegendItem(label=legend, renderers=[rend])
-            self.legend.items.append(li)
+            self.legend_items.append(li)
     
         if tooltips is not None:
             if tooltips == 'all':
@@ -691,7 +721,7 @@ class Theto(object):
                     if k not in ('xsf', 'ysf', 'xsp', 'ysp', 'x_coord_point', 'y_coord_point', 'raw_data')
                 ]
 
-        self.plot.add_tools(HoverTool(tooltips=tooltips, renderers=[rend]))
+        self.hover_tools.append(HoverTool(tooltips=tooltips, renderers=[rend]))
 
         if click_for_map is not None:
             taptool = self.plot.select(type=TapTool)
@@ -731,105 +761,119 @@ class Theto(object):
         """
     
         self._validate_workflow('add_path')
+
+        if edge_type not in ('curved', 'straight'):
+            raise ValueError('Keyword `edge_type` must be either "curved" or "straight".')
         
-        source = self.sources[source_label].copy()
-        
-        suffix = '_transform' if type(self.plot) != GMapPlot else ''
-        x_point_label = 'x_coord_point{}'.format(suffix)
-        y_point_label = 'y_coord_point{}'.format(suffix)
-
-        if all(isinstance(x, (int, float)) for x in source[links].tolist()):
-            x1 = source.sort_values(links)[x_point_label].values
-            y1 = source.sort_values(links)[y_point_label].values
-            x2 = x1[1:]
-            y2 = y1[1:]
-            x1 = x1[:-1]
-            y1 = y1[:-1]
-            x3 = (x1 + x2) / 2
-            y3 = (y1 + y2) / 2
-            xc = x3 + abs(y3-y2)
-            yc = y3 + abs(x3-x2)
-
-            new_source = {'x1': x1, 'x2': x2, 'xc': xc, 'y1': y1, 'y2': y2, 'yc': yc}
-
-            for c in source.columns:
-                if (c not in self.omit_columns) and c not in new_source:
-                    new_source[c] = source[c].values[:-1] 
-        elif all(isinstance(x, (list, tuple, set)) for x in source[links].tolist()):
+        # only read from, so the stored source is used without copying it
+        source = self.sources[source_label]
+        
+        xs = source[self.coordinate_columns.x_point].to_numpy()
+        ys = source[self.coordinate_columns.y_point].to_numpy()
+
+        # each branch finds the row each edge starts from and the coordinates of
+        # both of its ends; typed columns are recognized as numeric from their
+        # dtype alone, and object columns of iterables from their first value
+        link_values = source[links].to_numpy()
+        numeric_links = link_values.dtype.kind in 'biuf'
+        iterable_links = (
+            (not numeric_links) and (len(link_values) > 0) and isinstance(link_values[0], (list, tuple, set))
+        )
+        if numeric_links or (
+            (not iterable_links) and all(isinstance(x, (int, float)) for x in link_values)
+        ):
+            # sort once; consecutive records are linked
+            order = argsort(link_values, kind='stable')
+            a_idx = order[:-1]
+
+            # both ends of each edge are views of the coordinates gathered in order
+            xs_sorted, ys_sorted = xs[order], ys[order]
+            x1, x2, y1, y2 = xs_sorted[:-1], xs_sorted[1:], ys_sorted[:-1], ys_sorted[1:]
+        elif iterable_links:
             if 'uid' not in source.columns:
                 raise ValueError('Source must contain column `uid` when links is a list of iterables.')
                 
-            nodes = source['uid'].tolist()
-            edges = source[links].tolist()
-            node_x = source.set_index('uid')[x_point_label].to_dict()
-            node_y = source.set_index('uid')[y_point_label].to_dict()
-
-            a_vals, x1, x2, y1, y2 = zip(*[
-                (a, node_x[a], node_x[b], node_y[a], node_y[b]) 
-                for a, bs in zip(nodes, edges) for b in bs
-            ])
-            x1, x2, y1, y2 = array(x1), array(x2), array(y1), array(y2)    
-            x3 = (x1 + x2) / 2
-            y3 = (y1 + y2) / 2
-            xc = x3 + abs(y3-y2)
-            yc = y3 + abs(x3-x2)
-
-            new_source = {'x1': x1, 'x2': x2, 'xc': xc, 'y1': y1, 'y2': y2, 'yc': yc}
-            
-            for c in source.columns:
-                if (c not in self.omit_columns) and c not in new_source:
-                    col_dict = source.set_index('uid', drop=False)[c].to_dict()
-                    new_source[c] = [col_dict[v] for v in a_vals]
+            # one entry per edge: the position of the record it starts from
+            # (repeated once per link, from the precounted link lengths), and
+            # the position of the record whose uid it links to
+            n_links = fromiter(map(len, link_values), dtype='int64', count=len(link_values))
+            uid_positions = Series(arange(source.shape[0]), index=source['uid'].to_numpy())
+            a_idx = repeat(arange(len(link_values)), n_links)
+            b_idx = uid_positions.loc[list(chain.from_iterable(link_values))].to_numpy()
+            x1, x2, y1, y2 = xs[a_idx], xs[b_idx], ys[a_idx], ys[b_idx]
         else:
             raise ValueError(
                 'Values of `links` field must be numeric or a list, set, or tuple of values from the `uid` field.'
             )
+
+        new_source = {'x1': x1, 'x2': x2, 'y1': y1, 'y2': y2}
+
+        # only curved edges have control points
+        if edge_type == 'curved':
+            new_source['xc'], new_source['yc'] = coordinate_utils.path_control_points(x1, y1, x2, y2)
+
+        # each edge carries the values of the record it starts from; numeric
+        # columns go to Bokeh as contiguous arrays
+        for c in source.columns:
+            if (c not in self.omit_columns) and c not in new_source:
+                new_source[c] = bokeh_utils.column_data(source[c].to_numpy()[a_idx])
         
-        if 'color' in kwargs.keys():
+        if 'color' in kwargs:
             color = kwargs.pop('color')
-            for v in Quadratic.dataspecs():
-                if 'color' in v:
-                    kwargs[v] = color
+            for v in QUADRATIC_COLOR_SPECS:
+                kwargs[v] = color
 
-        if 'alpha' in kwargs.keys():
+        if 'alpha' in kwargs:
             alpha = kwargs.pop('alpha')
-            for v in Quadratic.dataspecs():
-                if 'alpha' in v:
-                    kwargs[v] = alpha
+            for v in QUADRATIC_ALPHA_SPECS:
+                kwargs[v] = alpha
                 
         if edge_type == 'curved':
             model_object = Quadratic(
                 x0='x1', y0='y1', x1="x2", y1="y2", cx="xc", cy="yc", name=source_label, **kwargs
             )
-        elif edge_type == 'straight':
+        else:
             model_object = Segment(
                 x0='x1', y0='y1', x1="x2", y1="y2", name=source_label, **kwargs
             )
-        else:
-            raise ValueError('Keyword `edge_type` must be either "curved" or "straight".')
 
         source = ColumnDataSource(new_source, name=source_label)
         rend = self.plot.add_glyph(source, model_object)
         
         if legend is not None:
             li = LegendItem(label=legend, renderers=[rend])
-            self.legend.items.append(li)
+            self.legend_items.append(li)
     
         if tooltips is not None:
-            self.plot.add_tools(HoverTool(tooltips=tooltips, renderers=[rend]))
+            self.hover_tools.append(HoverTool(tooltips=tooltips, renderers=[rend]))
             
         return self
 
-    def add_data_table(self, source_label, columns='all', **kwargs):
+    def add_data_table(self, source_label, columns='all', max_width_sample=2000, **kwargs):
+        """
+        Add a table of a source's data below the plot.
+
+        Parameters:
+
+        source_label (str): string corresponding to a label previously
+            called in `self.add_source`
+        columns (str or list): a list of column names, or 'all', 'point',
+            'raw_data' or 'meta' (the same choices as `tooltips` in `add_layer`)
+        max_width_sample (int): column widths are estimated from the first
+            and last `max_width_sample // 2` values of longer columns; if
+            None, every value is measured
+        kwargs: options passed to the Bokeh DataTable
+
+        """
 
         self._validate_workflow('add_data_table')
 
         source = self.columndatasources[source_label]
 
         if isinstance(columns, (list, tuple)):
+            keep_cols = frozenset(columns)
             columns = {
-                k: max([len(str(val)) for val in v] + [len(k)]) for k, v in source.data.items()
-                if k in columns
+                k: bokeh_utils.text_width(k, v, max_width_sample) for k, v in source.data.items() if k in keep_cols
             }
         else:
             if columns == 'all':
@@ -841,10 +885,11 @@ class Theto(object):
             elif columns == 'meta':
                 omit_cols = ('xsf', 'ysf', 'xsp', 'ysp', 'x_coord_point', 'y_coord_point', 'raw_data')
             else:
-                omit_cols = list()
+                omit_cols = tuple()
+            omit_cols = frozenset(omit_cols)
 
             columns = {
-                k: max([len(str(val)) for val in v] + [len(k)]) for k, v in source.data.items()
+                k: bokeh_utils.text_width(k, v, max_width_sample) for k, v in source.data.items()
                 if k not in omit_cols
             }
 
@@ -872,43 +917,34 @@ class Theto(object):
 
         return self
             
-    def render_plot(
-        self, display_type='object', directory=None, legend_position='below', 
-        legend_orientation='horizontal', widget_position='left'
-    ):
+    def _assemble_layout(self, legend_position, legend_orientation, widget_position):
         """
-        Pull everything together into a plot ready for display.
-        
-        Parameters:
-        
-        display_plot (str): either 'object', 'notebook', or an 
-            arbitrary string. If 'object', it returns the plot object. 
-            If 'notebook', the plot is displayed in the notebok. 
-            If an arbitrary string that does not match one of the other pptions, 
-            the plot is saved to '{display_plot}.html' in the current working 
-            directory if `directory` is None, or in `directory` if not None.
-            
-        legend_position (str): 'below', 'above', 'left', or 'right'
-        legend_orientation (str): 'horizontal' or 'vertical'
-        widget_position (str): 'below', 'above', 'left', or 'right'
-        
+        Drop unused coordinate columns, add the hover tools and legend to the
+        plot and wrap it with the colorbar, widgets and data tables, returning
+        the layout.
+
         """
-        
-        self._validate_workflow('render_plot')
 
-        for k in self.columndatasources.keys():
-            for suffix in self.remove_columns[k]:
-                self.columndatasources[k].data.pop('xs' + suffix)
-                self.columndatasources[k].data.pop('ys' + suffix)
+        # drop the unused coordinate columns with one replacement of each
+        # source's data, rather than one change notification per column
+        for k, source in self.columndatasources.items():
+            unused = {axis + suffix for suffix in self.remove_columns[k] for axis in ('xs', 'ys')}
+            if unused:
+                source.data = {c: v for c, v in source.data.items() if c not in unused}
         
-        if len(self.legend.items) > 0:
+        if len(self.hover_tools) > 0:
+            self.plot.add_tools(*self.hover_tools)
+
+        if len(self.legend_items) > 0:
+            self.legend.items.extend(self.legend_items)
             self.legend.orientation = legend_orientation
             self.plot.add_layout(self.legend, legend_position)
 
         self.plot.toolbar.autohide = self.autohide
+        layout = self.plot
 
         if self.colorbar is not None:
-            self.plot = Row(children=[self.plot, self.colorbar])
+            layout = Row(children=[layout, self.colorbar])
 
         if len(self.widgets) > 0:
 
@@ -932,16 +968,50 @@ class Theto(object):
             if widget_position not in ('left', 'right', 'above', 'below'):
                 raise ValueError("Valid widget positions are 'left', 'right', 'above', 'below'.")
             if widget_position == 'left':
-                self.plot = Row(children=[WidgetBox(children=widget_list), self.plot])
+                layout = Row(children=[WidgetBox(children=widget_list), layout])
             if widget_position == 'right':
-                self.plot = Row(children=[self.plot, WidgetBox(children=widget_list)])
+                layout = Row(children=[layout, WidgetBox(children=widget_list)])
             if widget_position == 'above':
-                self.plot = Column(children=[WidgetBox(children=widget_list), self.plot])
+                layout = Column(children=[WidgetBox(children=widget_list), layout])
             if widget_position == 'below':
-                self.plot = Column(children=[self.plot, WidgetBox(children=widget_list)])
+                layout = Column(children=[layout, WidgetBox(children=widget_list)])
 
         if len(self.data_tables) > 0:
-            self.plot = Column(children=[self.plot] + self.data_tables)
+            layout = Column(children=[layout] + self.data_tables)
+
+        return layout
+
+    def render_plot(
+        self, display_type='object', directory=None, legend_position='below', 
+        legend_orientation='horizontal', widget_position='left'
+    ):
+        """
+        Pull everything together into a plot ready for display.
+        
+        Parameters:
+        
+        display_plot (str): either 'object', 'notebook', or an 
+            arbitrary string. If 'object', it returns the plot object. 
+            If 'notebook', the plot is displayed in the notebok. 
+            If an arbitrary string that does not match one of the other pptions, 
+            the plot is saved to '{display_plot}.html' in the current working 
+            directory if `directory` is None, or in `directory` if not None.
+            
+        legend_position (str): 'below', 'above', 'left', or 'right'
+        legend_orientation (str): 'horizontal' or 'vertical'
+        widget_position (str): 'below', 'above', 'left', or 'right'
+
+        The layout options only apply to the first call; calling this method
+        again displays, saves or returns the layout built then.
+        
+        """
+        
+        self._validate_workflow('render_plot')
+
+        # the layout is only assembled on the first call; later calls display
+        # or return that same layout instead of wrapping it again
+        if not self.validation['render_plot']:
+            self.plot = self._assemble_layout(legend_position, legend_orientation, widget_position)
 
         self.validation['render_plot'] = True
         